@@ -15,9 +15,6 @@ struct PersonalityModelConfig {
     /// Top-k tokens selected at inference time.
     var topK: Int = 8
 
-    /// Temperature applied to the softmax output before sampling.
-    var temperature: Float = 1.0
-
     /// Fixed vocabulary size (must match PersonalityVocabulary.tokens.count).
     let vocabularySize: Int = PersonalityVocabulary.tokens.count
 
@@ -19,6 +19,12 @@ enum PersonalityVocabulary {
         return fallbackTokens
     }()
 
+    /// Token → position in `tokens`, built once per process alongside the list.
+    /// Duplicates (if any) keep their first position, matching `firstIndex(of:)`.
+    static let index: [String: Int] = Dictionary(
+        zip(tokens, tokens.indices), uniquingKeysWith: { first, _ in first }
+    )
+
     // MARK: - Sampling
 
     /// Returns a random sample of `k` tokens (for bootstrap / fallback inference).
@@ -38,6 +44,24 @@ enum PersonalityVocabulary {
         return Array(indices.prefix(k).map { tokens[$0] })
     }
 
+    // MARK: - Ranking
+
+    /// Returns the tokens with the `k` highest logits, highest first.
+    /// Keeps a running top-k instead of sorting all scores: O(n·k) for k ≪ n (8 of 325).
+    static func topTokens(for logits: [Float], k: Int) -> [String] {
+        let k = min(k, logits.count)
+        guard k > 0 else { return [] }
+        var best: [(index: Int, value: Float)] = []
+        best.reserveCapacity(k + 1)
+        for (i, v) in logits.enumerated() {
+            if best.count == k, let last = best.last, !(v > last.value) { continue }
+            let pos = best.firstIndex(where: { v > $0.value }) ?? best.count
+            best.insert((i, v), at: pos)
+            if best.count > k { best.removeLast() }
+        }
+        return best.compactMap { $0.index < tokens.count ? tokens[$0.index] : nil }
+    }
+
     // MARK: - Fallback (used only when JSON is absent)
 
     private static let fallbackTokens: [String] = [
@@ -48,8 +72,9 @@ enum PersonalityVocabulary {
     ]
 }
 
-// Lightweight seeded PRNG (xorshift64) used for reproducible bootstrap sampling.
-private struct SeededRNG {
+// Lightweight seeded PRNG (xorshift64) used for reproducible bootstrap sampling, and as a
+// fast non-cryptographic source for RandomWeightEngine's weight initialisation.
+struct SeededRNG: RandomNumberGenerator {
     var state: UInt64
     init(seed: UInt64) { state = seed == 0 ? 1 : seed }
     mutating func next() -> UInt64 {
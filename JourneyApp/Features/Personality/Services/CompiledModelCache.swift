@@ -0,0 +1,137 @@
+import Foundation
+import CoreML
+
+// MARK: - CompiledModelCache
+// Keeps the result of MLModel.compileModel(at:) for .mlpackage sources so later launches
+// reuse the compiled .mlmodelc instead of recompiling into a fresh temp directory.
+//
+// Layout (inside Application Support/PersonalityModels/):
+//   Compiled/<name>.mlmodelc  — compiled model
+//   Compiled/<name>.stamp     — source path + newest file date + byte count of the package
+// Any change to the source package produces a different stamp and triggers a recompile.
+// Compiled/ is excluded from backup: everything in it can be rebuilt from the source packages.
+
+enum CompiledModelCache {
+
+    /// Subdirectory of the models directory that holds compiled models.
+    static func directory(in modelsDirectory: URL) -> URL {
+        modelsDirectory.appendingPathComponent("Compiled", isDirectory: true)
+    }
+
+    /// Returns a compiled .mlmodelc for `packageURL`, compiling only when no fresh copy is cached.
+    /// Concurrent calls for the same model share one compile instead of racing on the cache slot.
+    /// `compile` is MLModel.compileModel(at:) outside of tests.
+    static func compiledURL(
+        for packageURL: URL,
+        cacheDirectory: URL,
+        compile: @escaping @Sendable (URL) async throws -> URL = { try await MLModel.compileModel(at: $0) }
+    ) async throws -> URL {
+        let name   = packageURL.deletingPathExtension().lastPathComponent
+        let cached = cacheDirectory.appendingPathComponent("\(name).mlmodelc", isDirectory: true)
+        return try await InFlightCompiles.shared.run(key: cached.path) {
+            try await compileIfStale(packageURL, name: name, cached: cached, cacheDirectory: cacheDirectory, compile: compile)
+        }
+    }
+
+    // MARK: - Private
+
+    private static func compileIfStale(
+        _ packageURL: URL,
+        name: String,
+        cached: URL,
+        cacheDirectory: URL,
+        compile: (URL) async throws -> URL
+    ) async throws -> URL {
+        let fm       = FileManager.default
+        let stampURL = cacheDirectory.appendingPathComponent("\(name).stamp")
+        let stamp    = sourceStamp(for: packageURL)
+
+        if fm.fileExists(atPath: cached.path),
+           let stored = try? String(contentsOf: stampURL, encoding: .utf8), stored == stamp {
+            return cached
+        }
+
+        let compiled = try await compile(packageURL)
+        // Stage under a unique name next to the cache slot, then swap it in, so a reader of
+        // `cached` never sees a half-removed directory. The stamp is written only after the swap.
+        let staged = cacheDirectory.appendingPathComponent("\(name).\(UUID().uuidString).mlmodelc", isDirectory: true)
+        do {
+            try fm.createDirectory(at: cacheDirectory, withIntermediateDirectories: true)
+            excludeFromBackup(cacheDirectory)
+            try fm.moveItem(at: compiled, to: staged)
+            if fm.fileExists(atPath: cached.path) {
+                _ = try fm.replaceItemAt(cached, withItemAt: staged)
+            } else {
+                try fm.moveItem(at: staged, to: cached)
+            }
+            try stamp.write(to: stampURL, atomically: true, encoding: .utf8)
+            return cached
+        } catch {
+            // Caching is best-effort — whichever copy survived is still a valid compiled model.
+            print("[CompiledModelCache] could not cache \(name): \(error)")
+            if fm.fileExists(atPath: compiled.path) { return compiled }
+            if fm.fileExists(atPath: staged.path)   { return staged }
+            return cached
+        }
+    }
+
+    /// Compiled models are large (≈70 MB together) and rebuildable, so keep them out of iCloud backups.
+    private static func excludeFromBackup(_ directory: URL) {
+        var url = directory
+        var values = URLResourceValues()
+        values.isExcludedFromBackup = true
+        do {
+            try url.setResourceValues(values)
+        } catch {
+            print("[CompiledModelCache] could not exclude \(directory.lastPathComponent) from backup: \(error)")
+        }
+    }
+
+    /// A .mlpackage is a directory whose own mtime does not change when a weight file is
+    /// rewritten, so the stamp covers every file inside it.
+    private static func sourceStamp(for packageURL: URL) -> String {
+        let keys: Set<URLResourceKey> = [.contentModificationDateKey, .fileSizeKey]
+        var newest: TimeInterval = 0
+        var bytes = 0
+        if let items = FileManager.default.enumerator(at: packageURL, includingPropertiesForKeys: Array(keys)) {
+            for case let item as URL in items {
+                guard let values = try? item.resourceValues(forKeys: keys) else { continue }
+                newest = max(newest, values.contentModificationDate?.timeIntervalSince1970 ?? 0)
+                bytes += values.fileSize ?? 0
+            }
+        }
+        return "\(packageURL.path)|\(newest)|\(bytes)"
+    }
+}
+
+// MARK: - InFlightCompiles
+
+/// One compile task per cache slot; later callers await the running task instead of starting another.
+private actor InFlightCompiles {
+    static let shared = InFlightCompiles()
+
+    private var tasks: [String: Task<URL, Error>] = [:]
+
+    func run(key: String, _ operation: @escaping @Sendable () async throws -> URL) async throws -> URL {
+        if let running = tasks[key] { return try await running.value }
+        let task = Task { try await operation() }
+        tasks[key] = task
+        defer { tasks[key] = nil }
+        return try await task.value
+    }
+}
+
+// MARK: - MLModelConfiguration
+
+extension MLModelConfiguration {
+    /// For models that only run forward and are never trained on device (MiniLM, the backbone).
+    /// FP16 GPU accumulation perturbs their outputs slightly; the backbone's latents feed the head
+    /// that ranks tokens, so near-tied tokens may swap. The head trains and infers on latents from
+    /// this same configuration, so it sees consistent inputs. Updatable models keep the default.
+    static var frozenInference: MLModelConfiguration {
+        let config = MLModelConfiguration()
+        config.computeUnits = .all
+        config.allowLowPrecisionAccumulationOnGPU = true
+        return config
+    }
+}
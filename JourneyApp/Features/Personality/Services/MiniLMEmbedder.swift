@@ -13,6 +13,7 @@ import Accelerate
 //   input  "input_ids"       : Int32[1, seqLen]
 //   input  "attention_mask"  : Int32[1, seqLen]
 //   input  "token_type_ids"  : Int32[1, seqLen]  — all zeros for single-sentence input
+//   seqLen is read from the input_ids shape at load (maxSeqLen for the bundled fixed-shape export)
 //   output "sentence_embeddings" | "pooler_output" | "last_hidden_state"
 //          → Float32[1, 384] or Float32[1, seqLen, 384] (pooled here if needed)
 
@@ -24,32 +25,68 @@ actor MiniLMEmbedder {
     static let vocabName  = "all-MiniLM-L6-v2-vocab.txt"
     static let outputDim  = 384
     static let maxSeqLen  = 128
+    static let vocabSize  = 30_522
+    /// Finished embeddings kept per token sequence; the same messages are re-embedded by inference,
+    /// reference-embedding and training passes. 0 disables the cache.
+    static let embeddingCacheLimit = 256
+
+    // BERT basic-tokenizer split classes, built once rather than per scalar
+    private static let whitespace      = CharacterSet.whitespacesAndNewlines
+    private static let punctuationSet  = CharacterSet.punctuationCharacters.union(.symbols)
 
     // Candidate CoreML output feature names (tried in order)
     private static let outputFeatureNames = ["sentence_embeddings", "pooler_output", "last_hidden_state"]
 
+    /// How long a failed search is trusted before loadIfNeeded() probes the candidates again,
+    /// e.g. after the model has been downloaded into the models directory.
+    private static let loadRetryInterval: TimeInterval = 60
+
     // MARK: - State
 
     private var model: MLModel?
     private(set) var modelURL: URL?          // the URL from which model was loaded
+    private var lastLoadFailure: Date?       // every candidate failed at this time; don't rescan per embed
+    private var loadTask: Task<Bool, Never>? // load in progress; concurrent callers await it
     private var vocab: [String: Int] = [:]   // token → vocab index
+    private var longestVocabEntry = 0        // in Characters; no longer candidate can match
     private var resolvedOutputFeatureName: String?  // discovered from model metadata at load time
+    private var zeroTokenTypes: [Int: MLMultiArray] = [:]  // constant all-zero token_type_ids, per length
+    private var inputBuffers: [Int: (ids: MLMultiArray, mask: MLMultiArray)] = [:]  // rewritten every embed()
+    private var embeddingCache: [[Int32]: [Float]] = [:]  // token ids → embedding, bounded FIFO
+    private var embeddingCacheOrder: [[Int32]] = []       // insertion order for eviction
+    private var inputLength = MiniLMEmbedder.maxSeqLen  // from the input_ids shape constraint
 
     /// Human-readable name of the active embedder; set after loadIfNeeded().
     private(set) var activeEmbedderName: String = "not-loaded"
 
     // MARK: - Init
 
+    /// Shared by every PersonalityModelService so the model, vocab and embedding cache
+    /// are loaded once per process rather than once per screen.
+    static let shared = MiniLMEmbedder()
+
     init() {}
 
     // MARK: - Loading
 
     /// Finds and loads the all-MiniLM-L6-v2 model.  Call once before embed().
-    /// Returns true if the CoreML model loaded successfully.
+    /// Returns true if the CoreML model loaded successfully. A failed search is remembered for
+    /// loadRetryInterval, so callers that invoke this before every embed don't re-probe and
+    /// recompile each time, while a model that appears later is still picked up.
+    /// The actor is reentrant across the compile, so a load already in progress is shared.
     @discardableResult
     func loadIfNeeded(modelsDirectory: URL) async -> Bool {
         guard model == nil else { return true }
+        if let lastLoadFailure, Date().timeIntervalSince(lastLoadFailure) < Self.loadRetryInterval { return false }
+        if let loadTask { return await loadTask.value }
 
+        let task = Task { await self.load(modelsDirectory: modelsDirectory) }
+        loadTask = task
+        defer { loadTask = nil }
+        return await task.value
+    }
+
+    private func load(modelsDirectory: URL) async -> Bool {
         let candidates = Self.candidateURLs(modelsDirectory: modelsDirectory)
         print("[MiniLMEmbedder] Initialising '\(Self.modelName)' — checking \(candidates.count) location(s)")
 
@@ -63,7 +100,9 @@ actor MiniLMEmbedder {
             let loadURL: URL
             if candidate.pathExtension == "mlpackage" {
                 do {
-                    loadURL = try await MLModel.compileModel(at: candidate)
+                    loadURL = try await CompiledModelCache.compiledURL(
+                        for: candidate, cacheDirectory: CompiledModelCache.directory(in: modelsDirectory)
+                    )
                     print("[MiniLMEmbedder] Compiled .mlpackage → \(loadURL.lastPathComponent)")
                 } catch {
                     print("[MiniLMEmbedder] ✗ compile failed (\(candidate.lastPathComponent)): \(error)")
@@ -73,7 +112,7 @@ actor MiniLMEmbedder {
                 loadURL = candidate
             }
 
-            if let loaded = try? MLModel(contentsOf: loadURL) {
+            if let loaded = try? MLModel(contentsOf: loadURL, configuration: .frozenInference) {
                 model    = loaded
                 modelURL = candidate
                 activeEmbedderName = Self.modelName
@@ -87,48 +126,55 @@ actor MiniLMEmbedder {
                         print("[MiniLMEmbedder] ⚠️ no expected output key found; using '\(name)' (actual keys: \(actualKeys))")
                     }
                 }
-                print("[MiniLMEmbedder] ✅ Loaded embedder: \(Self.modelName) from \(candidate.path)")
+                inputLength = Self.inputLength(of: loaded)
+                print("[MiniLMEmbedder] ✅ Loaded embedder: \(Self.modelName) from \(candidate.path) (input length: \(inputLength))")
                 loadVocab(nearModel: candidate, modelsDirectory: modelsDirectory)
+                lastLoadFailure = nil
                 return true
             }
             print("[MiniLMEmbedder] ✗ MLModel init failed: \(candidate.path)")
         }
 
         print("[MiniLMEmbedder] ⚠️ \(Self.modelName) not available — caller should fall back to NLEmbedding")
+        lastLoadFailure = Date()
         return false
     }
 
     // MARK: - Embedding
 
     /// Returns a 384-dim embedding, or nil if the model isn't loaded or inference fails.
+    /// Repeated inputs are served from a small cache without re-running the model. It is keyed by
+    /// the truncated token ids — what actually determines the embedding — so it holds at most
+    /// maxSeqLen ids per entry rather than the full (possibly very long) text.
     func embed(text: String) -> [Float]? {
         guard let model else { return nil }
-        let trimmed = text.trimmingCharacters(in: .whitespacesAndNewlines)
-        guard !trimmed.isEmpty else { return nil }
 
         guard !vocab.isEmpty else {
             print("[MiniLMEmbedder] ⚠️ vocab not loaded — cannot tokenize for \(Self.modelName)")
             return nil
         }
 
-        let (rawIds, rawMask) = tokenize(trimmed)
-        guard !rawIds.isEmpty else { return nil }
+        // The tokenizer skips all whitespace itself; [CLS] + [SEP] alone means there is nothing to embed.
+        // Cap at the longest input the model accepts, so ids always fit the padded arrays.
+        let rawIds = tokenize(text, maxLength: min(inputLength, Self.maxSeqLen))
+        guard rawIds.count > 2 else { return nil }
+        if let cached = embeddingCache[rawIds] { return cached }
 
-        // CoreML model was exported with fixed shape [1, maxSeqLen].
-        // Pad with 0s (padding token id=0, mask=0) to fill the fixed length.
-        let padLen  = Self.maxSeqLen
-        let padId:  Int32 = 0
-        let ids  = rawIds  + [Int32](repeating: padId, count: max(0, padLen - rawIds.count))
-        let mask = rawMask + [Int32](repeating: 0,     count: max(0, padLen - rawMask.count))
+        // Pad with 0s (padding token id=0, mask=0) up to the length the model was exported with.
+        let padLen = inputLength
 
         do {
-            let inputIds   = try MLMultiArray(shape: [1, NSNumber(value: padLen)], dataType: .int32)
-            let attnMask   = try MLMultiArray(shape: [1, NSNumber(value: padLen)], dataType: .int32)
-            let tokenTypes = try MLMultiArray(shape: [1, NSNumber(value: padLen)], dataType: .int32)
-            for i in 0..<padLen {
-                inputIds[i]   = NSNumber(value: ids[i])
-                attnMask[i]   = NSNumber(value: mask[i])
-                tokenTypes[i] = 0   // single-sentence: all token type IDs are 0
+            let (inputIds, attnMask) = try reusableInputs(length: padLen)
+            let tokenTypes = try constantTokenTypes(length: padLen)
+            // Overwrite the reused buffers in place; the mask is 1 for every real token.
+            let filled = min(rawIds.count, padLen)
+            inputIds.withUnsafeMutableBufferPointer(ofType: Int32.self) { ptr, _ in
+                ptr.update(repeating: 0)
+                for i in 0..<filled { ptr[i] = rawIds[i] }
+            }
+            attnMask.withUnsafeMutableBufferPointer(ofType: Int32.self) { ptr, _ in
+                ptr.update(repeating: 0)
+                for i in 0..<filled { ptr[i] = 1 }
             }
 
             let provider = try MLDictionaryFeatureProvider(dictionary: [
@@ -146,9 +192,10 @@ actor MiniLMEmbedder {
 
             for featureName in featureNamesToTry {
                 guard let arr = output.featureValue(for: featureName)?.multiArrayValue else { continue }
-                // The model does mean-pooling internally; pass rawMask for any Swift-side fallback pooling.
-                let embedding = poolToVector(arr, seqLen: padLen, mask: rawMask)
+                // The model does mean-pooling internally; the real-token count drives any Swift-side fallback pooling.
+                let embedding = poolToVector(arr, tokenCount: rawIds.count)
                 print("[MiniLMEmbedder] embed() → \(Self.modelName) via '\(featureName)': \(embedding.count) dims")
+                cacheEmbedding(embedding, for: rawIds)
                 return embedding
             }
 
@@ -160,6 +207,51 @@ actor MiniLMEmbedder {
         return nil
     }
 
+    // MARK: - Private: Embedding cache
+
+    private func cacheEmbedding(_ embedding: [Float], for tokenIds: [Int32]) {
+        guard Self.embeddingCacheLimit > 0, embeddingCache[tokenIds] == nil else { return }
+        if embeddingCacheOrder.count >= Self.embeddingCacheLimit {
+            embeddingCache[embeddingCacheOrder.removeFirst()] = nil
+        }
+        embeddingCache[tokenIds] = embedding
+        embeddingCacheOrder.append(tokenIds)
+    }
+
+    // MARK: - Private: Reusable inputs
+
+    /// input_ids / attention_mask arrays for `length`, allocated once and overwritten per call.
+    /// Safe to share: the actor runs one prediction at a time and Core ML only reads them during it.
+    private func reusableInputs(length: Int) throws -> (ids: MLMultiArray, mask: MLMultiArray) {
+        if let cached = inputBuffers[length] { return cached }
+        let shape = [1, NSNumber(value: length)]
+        let buffers = (ids:  try MLMultiArray(shape: shape, dataType: .int32),
+                       mask: try MLMultiArray(shape: shape, dataType: .int32))
+        inputBuffers[length] = buffers
+        return buffers
+    }
+
+    // MARK: - Private: Constant inputs
+
+    /// Single-sentence input: every token type ID is 0, so the array never changes between calls.
+    private func constantTokenTypes(length: Int) throws -> MLMultiArray {
+        if let cached = zeroTokenTypes[length] { return cached }
+        let arr = try MLMultiArray(shape: [1, NSNumber(value: length)], dataType: .int32)
+        arr.withUnsafeMutableBufferPointer(ofType: Int32.self) { ptr, _ in ptr.update(repeating: 0) }
+        zeroTokenTypes[length] = arr
+        return arr
+    }
+
+    // MARK: - Private: Input length
+
+    /// Sequence length of the model's "input_ids" shape. For a flexible export this is its default
+    /// shape, which is always an accepted size; the bundled model is fixed at maxSeqLen.
+    private static func inputLength(of model: MLModel) -> Int {
+        let shape = model.modelDescription.inputDescriptionsByName["input_ids"]?.multiArrayConstraint?.shape
+        guard let length = shape?.last?.intValue, length > 0 else { return maxSeqLen }
+        return length
+    }
+
     // MARK: - Private: Model URL candidates
 
     private static func candidateURLs(modelsDirectory: URL) -> [URL] {
@@ -189,16 +281,27 @@ actor MiniLMEmbedder {
 
         for url in candidates {
             print("[MiniLMEmbedder] Trying vocab path: \(url.path)")
-            guard let content = try? String(contentsOf: url, encoding: .utf8) else {
+            // Memory-map the file and split on raw bytes — no full String copy of the ~230 KB vocab.
+            guard let data = try? Data(contentsOf: url, options: .alwaysMapped) else {
                 print("[MiniLMEmbedder] ✗ vocab not found: \(url.path)")
                 continue
             }
+            // Line number == token id, so one pass over the lines fills the table.
             var built: [String: Int] = [:]
-            content.components(separatedBy: .newlines).enumerated().forEach { idx, line in
-                let token = line.trimmingCharacters(in: .whitespacesAndNewlines)
-                if !token.isEmpty { built[token] = idx }
+            built.reserveCapacity(Self.vocabSize)
+            var longest = 0
+            var idx = 0
+            for line in data.split(separator: UInt8(ascii: "\n"), omittingEmptySubsequences: false) {
+                let bytes = line.last == UInt8(ascii: "\r") ? line.dropLast() : line
+                if !bytes.isEmpty {
+                    let token = String(decoding: bytes, as: UTF8.self)
+                    built[token] = idx
+                    longest = max(longest, token.count)
+                }
+                idx += 1
             }
             vocab = built
+            longestVocabEntry = longest
             print("[MiniLMEmbedder] ✅ Loaded vocab (\(vocab.count) tokens) from \(url.path)")
             return
         }
@@ -207,18 +310,21 @@ actor MiniLMEmbedder {
 
     // MARK: - Private: WordPiece tokenisation (BERT-style)
 
-    private func tokenize(_ text: String) -> (ids: [Int32], mask: [Int32]) {
+    /// Token ids framed by [CLS] and [SEP]. `maxLength` includes both; longer input is truncated
+    /// to fit. No attention mask is built: embed() sets it from the id count.
+    private func tokenize(_ text: String, maxLength: Int) -> [Int32] {
         guard let clsId  = vocab["[CLS]"],
               let sepId  = vocab["[SEP]"],
               let unkId  = vocab["[UNK]"] else {
             print("[MiniLMEmbedder] ✗ required special tokens [CLS]/[SEP]/[UNK] not in vocab")
-            return ([], [])
+            return []
         }
-        let max = Self.maxSeqLen - 2   // reserve [CLS] + [SEP]
+        let max = maxLength - 2   // reserve [CLS] + [SEP]
+        guard max > 0 else { return [] }
 
         var wordPieces: [Int32] = []
-        let lowered = text.lowercased()
-        let words   = basicTokenize(lowered)
+        // Every word yields at least one piece, so no more than `max` words can ever fit.
+        let words = basicTokenize(text, limit: max)
 
         outer: for word in words {
             let pieces = wordPieceTokenize(word, unkId: unkId)
@@ -226,33 +332,36 @@ actor MiniLMEmbedder {
             wordPieces.append(contentsOf: pieces)
         }
 
-        var ids:  [Int32] = [Int32(clsId)] + wordPieces + [Int32(sepId)]
-        var mask: [Int32] = [Int32](repeating: 1, count: ids.count)
-
-        // Pad to maxSeqLen (optional — models often handle variable length, but some need fixed shape)
-        // We leave as variable length; the caller passes the actual seqLen.
-        return (ids, mask)
+        // Unpadded; embed() pads to the length the model accepts.
+        return [Int32(clsId)] + wordPieces + [Int32(sepId)]
     }
 
-    /// Splits on whitespace and punctuation (simplified BERT basic tokenizer).
-    private func basicTokenize(_ text: String) -> [String] {
+    /// Splits on whitespace and punctuation (simplified BERT basic tokenizer), lowercasing each
+    /// token as it is emitted. Stops after `limit` tokens so long documents are not walked in full.
+    private func basicTokenize(_ text: String, limit: Int) -> [String] {
         var tokens: [String] = []
         var current = ""
+        func flush() {
+            if !current.isEmpty { tokens.append(current.lowercased()); current = "" }
+        }
         for ch in text.unicodeScalars {
-            if CharacterSet.whitespaces.contains(ch) {
-                if !current.isEmpty { tokens.append(current); current = "" }
-            } else if CharacterSet.punctuationCharacters.union(.symbols).contains(ch) {
-                if !current.isEmpty { tokens.append(current); current = "" }
-                tokens.append(String(ch))
+            if tokens.count >= limit { break }
+            if Self.whitespace.contains(ch) {
+                flush()
+            } else if Self.punctuationSet.contains(ch) {
+                flush()
+                tokens.append(String(ch).lowercased())
             } else {
                 current.unicodeScalars.append(ch)
             }
         }
-        if !current.isEmpty { tokens.append(current) }
-        return tokens
+        flush()
+        return Array(tokens.prefix(limit))
     }
 
     /// Greedy longest-match WordPiece tokenizer.
+    /// Candidates start at the longest vocab entry rather than the end of the word, so a long
+    /// word no longer builds and hashes a substring for every possible end position.
     private func wordPieceTokenize(_ word: String, unkId: Int) -> [Int32] {
         guard !word.isEmpty else { return [] }
 
@@ -260,7 +369,7 @@ actor MiniLMEmbedder {
         var start = word.startIndex
 
         while start < word.endIndex {
-            var end   = word.endIndex
+            var end   = word.index(start, offsetBy: longestVocabEntry, limitedBy: word.endIndex) ?? word.endIndex
             var found = false
             let prefix = start == word.startIndex ? "" : "##"
 
@@ -285,30 +394,55 @@ actor MiniLMEmbedder {
 
     /// Extracts a 1-D Float vector from a CoreML MLMultiArray output.
     /// Handles both [1, 384] (already pooled) and [1, seqLen, 384] (mean-pool here).
-    private func poolToVector(_ arr: MLMultiArray, seqLen: Int, mask: [Int32]) -> [Float] {
+    /// Float32 outputs are read through the buffer with vDSP; other types take the boxed path.
+    /// The attention mask is 1 for exactly the first `tokenCount` positions, so pooling averages
+    /// those rows and divides by the integer count — no per-position mask test.
+    private func poolToVector(_ arr: MLMultiArray, tokenCount: Int) -> [Float] {
         let shape = arr.shape.map { $0.intValue }
+        guard arr.dataType == .float32 else { return boxedPoolToVector(arr, shape: shape, tokenCount: tokenCount) }
+        let dim     = Self.outputDim
+        let strides = arr.strides.map { $0.intValue }
+        return arr.withUnsafeBufferPointer(ofType: Float.self) { ptr in
+            guard let base = ptr.baseAddress else { return [] }
+            switch shape.count {
+            case 2 where shape[1] == dim:
+                // [1, 384] — already sentence embedding
+                var out = [Float](repeating: 0, count: dim)
+                cblas_scopy(Int32(dim), base, Int32(strides[1]), &out, 1)
+                return out
+            case 3 where shape[2] == dim:
+                // [1, seqLen, 384] — mean-pool over non-padding tokens
+                var pooled = [Float](repeating: 0, count: dim)
+                let count  = min(tokenCount, shape[1])
+                for t in 0..<count {
+                    cblas_saxpy(Int32(dim), 1, base + t * strides[1], Int32(strides[2]), &pooled, 1)
+                }
+                if count > 0 { vDSP.divide(pooled, Float(count), result: &pooled) }
+                return pooled
+            default:
+                // Flatten whatever we got and take first outputDim values
+                return Array(ptr.prefix(min(arr.count, dim)))
+            }
+        }
+    }
+
+    /// Element-by-element fallback for non-Float32 outputs (e.g. Float16 or Double exports).
+    private func boxedPoolToVector(_ arr: MLMultiArray, shape: [Int], tokenCount: Int) -> [Float] {
         switch shape.count {
         case 2 where shape[1] == Self.outputDim:
-            // [1, 384] — already sentence embedding
             return (0..<Self.outputDim).map { Float(truncating: arr[$0]) }
         case 3 where shape[2] == Self.outputDim:
-            // [1, seqLen, 384] — mean-pool over non-padding tokens
-            let s = shape[1]
             var pooled = [Float](repeating: 0, count: Self.outputDim)
-            var count: Float = 0
-            for t in 0..<s {
-                guard t < mask.count, mask[t] == 1 else { continue }
+            let count  = min(tokenCount, shape[1])
+            for t in 0..<count {
                 for d in 0..<Self.outputDim {
                     pooled[d] += Float(truncating: arr[t * Self.outputDim + d])
                 }
-                count += 1
             }
-            if count > 0 { for d in 0..<Self.outputDim { pooled[d] /= count } }
+            if count > 0 { for d in 0..<Self.outputDim { pooled[d] /= Float(count) } }
             return pooled
         default:
-            // Flatten whatever we got and take first outputDim values
-            let flat = (0..<min(arr.count, Self.outputDim)).map { Float(truncating: arr[$0]) }
-            return flat
+            return (0..<min(arr.count, Self.outputDim)).map { Float(truncating: arr[$0]) }
         }
     }
 }
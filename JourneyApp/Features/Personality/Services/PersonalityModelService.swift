@@ -43,7 +43,10 @@ actor PersonalityModelService {
     private var headModelURL: URL?
     private var randomEngine: RandomWeightEngine?
     private var modelsDirectory: URL
-    private var miniLMEmbedder: MiniLMEmbedder = MiniLMEmbedder()
+    private let miniLMEmbedder: MiniLMEmbedder = .shared
+    /// NLEmbedding fallbacks, kept once found. Actor-isolated because NLEmbedding is not Sendable.
+    private var sentenceEmbedding: NLEmbedding?
+    private var wordEmbedding: NLEmbedding?
 
     // MARK: - Init
 
@@ -95,7 +98,8 @@ actor PersonalityModelService {
         // Try CoreML first
         if coreMLModel == nil { await tryLoadCoreMLModel() }
         if let model = coreMLModel {
-            if let tokens = try? inferWithCoreML(model: model, embedding: embedding) {
+            if let input = try? backboneInput(for: embedding),
+               let tokens = try? inferWithCoreML(model: model, input: input) {
                 print("[Inference] OUTPUT (CoreML): \(tokens)")
                 print("[Inference] ═══════════════════════════════════════════")
                 return tokens
@@ -231,7 +235,8 @@ actor PersonalityModelService {
 
         if let bundleURL {
             let loadURL = await compiledURL(for: bundleURL, label: "backbone")
-            if let model = try? MLModel(contentsOf: loadURL) {
+            // The head keeps the default configuration: MLUpdateTask trains it as exported.
+            if let model = try? MLModel(contentsOf: loadURL, configuration: .frozenInference) {
                 coreMLModel    = model
                 coreMLModelURL = loadURL
                 print("[PersonalityModel] backbone loaded (\(bundleURL.pathExtension))")
@@ -279,11 +284,14 @@ actor PersonalityModelService {
         }
     }
 
-    /// Compiles a .mlpackage to a temp .mlmodelc if needed; returns .mlmodelc path otherwise.
+    /// Compiles a .mlpackage to .mlmodelc if needed (reused across launches via CompiledModelCache);
+    /// returns .mlmodelc path otherwise.
     private func compiledURL(for url: URL, label: String) async -> URL {
         guard url.pathExtension == "mlpackage" else { return url }
         do {
-            let compiled = try await MLModel.compileModel(at: url)
+            let compiled = try await CompiledModelCache.compiledURL(
+                for: url, cacheDirectory: CompiledModelCache.directory(in: modelsDirectory)
+            )
             print("[PersonalityModel] compiled \(label) from .mlpackage → \(compiled.lastPathComponent)")
             return compiled
         } catch {
@@ -310,41 +318,67 @@ actor PersonalityModelService {
     private static let headModelInputName  = "latent"
     private static let headModelInputDim   = 512
 
-    private func inferWithCoreML(model: MLModel, embedding: [Float]) throws -> [String] {
-        let targetDim = Self.stockModelInputDim
+    /// Builds the backbone's "embedding" input: tiles to 1536 dims (e.g. 384 → tile ×4),
+    /// truncates and L2-normalises. Built once per embedding and shared by inference and training.
+    /// Tiling and normalisation write straight into the input array — no intermediate copies.
+    private func backboneInput(for embedding: [Float]) throws -> MLMultiArray {
+        let targetDim  = Self.stockModelInputDim
+        let multiArray = try MLMultiArray(shape: [1, NSNumber(value: targetDim)], dataType: .float32)
 
-        // Tile embedding to 1536 dims (e.g. 384 → tile ×4), then truncate and L2-normalise.
-        var padded = embedding
-        while padded.count < targetDim {
-            padded.append(contentsOf: embedding.prefix(targetDim - padded.count))
+        var norm: Float = 0
+        multiArray.withUnsafeMutableBufferPointer(ofType: Float.self) { ptr, _ in
+            guard let out = ptr.baseAddress else { return }
+            embedding.withUnsafeBufferPointer { src in
+                guard let base = src.baseAddress, !src.isEmpty else {
+                    out.update(repeating: 0, count: targetDim); return
+                }
+                var filled = 0
+                while filled < targetDim {
+                    let n = min(src.count, targetDim - filled)
+                    (out + filled).update(from: base, count: n)
+                    filled += n
+                }
+            }
+            let tiled = UnsafeBufferPointer(start: out, count: targetDim)
+            norm = sqrt(vDSP.sumOfSquares(tiled))
+            if norm > 0 { vDSP_vsdiv(out, 1, &norm, out, 1, vDSP_Length(targetDim)) }
         }
-        padded = Array(padded.prefix(targetDim))
-        let norm = sqrt(padded.reduce(0) { $0 + $1 * $1 })
-        if norm > 0 { padded = padded.map { $0 / norm } }
-
-        print("[Inference] CoreML INPUT — embedding tiled \(embedding.count)→\(padded.count) dims, L2-norm before=\(String(format:"%.4f",norm)) (normalised to 1.0)")
 
-        let multiArray = try MLMultiArray(shape: [1, NSNumber(value: targetDim)], dataType: .float32)
-        for (i, v) in padded.enumerated() { multiArray[i] = NSNumber(value: v) }
+        print("[Inference] CoreML INPUT — embedding tiled \(embedding.count)→\(targetDim) dims, L2-norm before=\(String(format:"%.4f",norm)) (normalised to 1.0)")
+        return multiArray
+    }
 
-        let inputProvider  = try MLDictionaryFeatureProvider(dictionary: [Self.stockModelInputName: multiArray])
+    private func inferWithCoreML(model: MLModel, input: MLMultiArray) throws -> [String] {
+        let inputProvider  = try MLDictionaryFeatureProvider(dictionary: [Self.stockModelInputName: input])
         let outputProvider = try model.prediction(from: inputProvider)
+        return try decodeTokens(from: outputProvider)
+    }
 
+    /// Turns one backbone forward pass into top-k tokens, routing its latent through the
+    /// trained head when one is loaded. Callers that already ran the backbone reuse its output here.
+    /// `diagnostics` controls the latent/logit stats and logging — inference keeps them,
+    /// the per-sample training label loop skips them.
+    private func decodeTokens(from outputProvider: MLFeatureProvider, diagnostics: Bool = true) throws -> [String] {
         // Prefer updated head model (trained weights) over stock logits.
         // headModel takes the 512-dim latent from the backbone and produces fresh logits.
         if let head = headModel,
            let latentArray = outputProvider.featureValue(for: Self.latentOutputName)?.multiArrayValue {
-            let latentMin  = (0..<latentArray.count).map { Float(truncating: latentArray[$0]) }.min() ?? 0
-            let latentMax  = (0..<latentArray.count).map { Float(truncating: latentArray[$0]) }.max() ?? 0
-            print("[Inference] CoreML LATENT — \(latentArray.count) dims | min=\(String(format:"%.4f",latentMin)) max=\(String(format:"%.4f",latentMax)) → routing through trained head model")
+            if diagnostics {
+                let latent     = Self.floats(from: latentArray)
+                let latentMin  = latent.isEmpty ? 0 : vDSP.minimum(latent)
+                let latentMax  = latent.isEmpty ? 0 : vDSP.maximum(latent)
+                print("[Inference] CoreML LATENT — \(latentArray.count) dims | min=\(String(format:"%.4f",latentMin)) max=\(String(format:"%.4f",latentMax)) → routing through trained head model")
+            }
             let headInput = try MLDictionaryFeatureProvider(dictionary: [Self.headModelInputName: latentArray])
             let headOutput = try head.prediction(from: headInput)
             if let updatedLogits = headOutput.featureValue(for: Self.stockModelOutputName)?.multiArrayValue {
-                var logits = (0..<updatedLogits.count).map { Float(truncating: updatedLogits[$0]) }
-                let logMin = logits.min() ?? 0; let logMax = logits.max() ?? 0
-                print("[Inference] CoreML LOGITS (head) — \(logits.count) dims | min=\(String(format:"%.4f",logMin)) max=\(String(format:"%.4f",logMax))")
-                let tokens = topKTokens(from: &logits, k: config.topK, temperature: config.temperature)
-                print("[Inference] CoreML OUTPUT (head) — top-\(config.topK): \(tokens)")
+                let logits = Self.floats(from: updatedLogits)
+                if diagnostics {
+                    let logMin = logits.min() ?? 0; let logMax = logits.max() ?? 0
+                    print("[Inference] CoreML LOGITS (head) — \(logits.count) dims | min=\(String(format:"%.4f",logMin)) max=\(String(format:"%.4f",logMax))")
+                }
+                let tokens = PersonalityVocabulary.topTokens(for: logits, k: config.topK)
+                if diagnostics { print("[Inference] CoreML OUTPUT (head) — top-\(config.topK): \(tokens)") }
                 return tokens
             }
         }
@@ -354,74 +388,93 @@ actor PersonalityModelService {
             print("[Inference] CoreML OUTPUT — 'logits' feature not found in model response")
             return PersonalityVocabulary.randomSample(k: config.topK)
         }
-        var logits = (0..<logitsArray.count).map { Float(truncating: logitsArray[$0]) }
-        let logMin = logits.min() ?? 0; let logMax = logits.max() ?? 0
-        print("[Inference] CoreML LOGITS (backbone/stock) — \(logits.count) dims | min=\(String(format:"%.4f",logMin)) max=\(String(format:"%.4f",logMax))")
-        let tokens = topKTokens(from: &logits, k: config.topK, temperature: config.temperature)
-        print("[Inference] CoreML OUTPUT (stock) — top-\(config.topK): \(tokens)")
+        let logits = Self.floats(from: logitsArray)
+        if diagnostics {
+            let logMin = logits.min() ?? 0; let logMax = logits.max() ?? 0
+            print("[Inference] CoreML LOGITS (backbone/stock) — \(logits.count) dims | min=\(String(format:"%.4f",logMin)) max=\(String(format:"%.4f",logMax))")
+        }
+        let tokens = PersonalityVocabulary.topTokens(for: logits, k: config.topK)
+        if diagnostics { print("[Inference] CoreML OUTPUT (stock) — top-\(config.topK): \(tokens)") }
         return tokens
     }
 
+    /// Copies a 1-D or [1, N] MLMultiArray into a Float array, reading the Float32 buffer
+    /// directly instead of boxing every element through NSNumber.
+    private static func floats(from array: MLMultiArray) -> [Float] {
+        guard array.dataType == .float32 else {
+            return (0..<array.count).map { Float(truncating: array[$0]) }
+        }
+        return array.withUnsafeBufferPointer(ofType: Float.self) { Array($0.prefix(array.count)) }
+    }
+
     // MARK: - MLUpdateTask
 
     private func runMLUpdateTask(model: MLModel, messages: [Message], outputURL: URL) async throws {
         // MLUpdateTask runs on the HEAD MODEL ONLY (no attention layers → no reshape crashes).
-        // For each message we:
-        //   1. Run the backbone (full model) to get a 512-dim latent vector.
-        //   2. Run inference to get the current top token (used as the training label).
-        //   3. Build a batch of (latent, one-hot-label) pairs for the head model.
+        // We:
+        //   1. Embed every message into a backbone input.
+        //   2. Run the backbone (full model) once over the whole batch to get 512-dim latents.
+        //   3. Decode each backbone output to the current top token (used as the training label).
+        //   4. Build a batch of (latent, one-hot-label) pairs for the head model.
         guard let sourceURL = headModelURL else {
             throw ServiceError.trainingFailed("No head model URL — cannot run MLUpdateTask")
         }
 
-        var latents: [MLMultiArray] = []
-        var labels:  [Int]          = []
-        let vocabSize = PersonalityVocabulary.tokens.count
-
+        var backboneInputs: [MLFeatureProvider] = []
         for message in messages.prefix(50) {
-            guard let emb = await embed(text: message.text) else { continue }
-
-            // Prep 1536-dim normalised input for the backbone
-            var padded = emb
-            while padded.count < Self.stockModelInputDim {
-                padded.append(contentsOf: emb.prefix(Self.stockModelInputDim - padded.count))
+            guard let emb = await embed(text: message.text),
+                  let embArray  = try? backboneInput(for: emb),
+                  let inputProv = try? MLDictionaryFeatureProvider(dictionary: [Self.stockModelInputName: embArray]) else { continue }
+            backboneInputs.append(inputProv)
+        }
+        guard !backboneInputs.isEmpty else { throw ServiceError.trainingFailed("No embeddable messages for head training") }
+
+        // One batched call lets Core ML pipeline the samples instead of a round trip per message.
+        // It is synchronous and holds the actor for the whole batch (≤ 50 samples), which is
+        // acceptable for a background training run. If the batch fails, fall back to per-sample
+        // predictions so one bad input skips only that message, as before.
+        var backboneOutputs: [MLFeatureProvider] = []
+        do {
+            let batchOutputs = try model.predictions(from: MLArrayBatchProvider(array: backboneInputs),
+                                                     options: MLPredictionOptions())
+            backboneOutputs = (0..<batchOutputs.count).map { batchOutputs.features(at: $0) }
+        } catch {
+            print("[PersonalityModel] runMLUpdateTask() — batch prediction failed (\(error)); retrying per sample")
+            for input in backboneInputs {
+                if let output = try? await model.prediction(from: input) { backboneOutputs.append(output) }
             }
-            padded = Array(padded.prefix(Self.stockModelInputDim))
-            let norm = sqrt(padded.reduce(0) { $0 + $1 * $1 })
-            if norm > 0 { padded = padded.map { $0 / norm } }
-
-            guard let embArray = try? MLMultiArray(shape: [1, NSNumber(value: padded.count)], dataType: .float32) else { continue }
-            for (i, v) in padded.enumerated() { embArray[i] = NSNumber(value: v) }
-
-            // Run backbone → get latent + stock logits
-            guard let inputProv = try? MLDictionaryFeatureProvider(dictionary: [Self.stockModelInputName: embArray]),
-                  let outProv   = try? await model.prediction(from: inputProv),
-                  let latentArr = outProv.featureValue(for: Self.latentOutputName)?.multiArrayValue else { continue }
+        }
 
-            // Derive label from current best inference (stock or trained head)
-            let tokens = (try? inferWithCoreML(model: model, embedding: emb)) ?? []
-            let label  = tokens.first.flatMap { PersonalityVocabulary.tokens.firstIndex(of: $0) } ?? 0
+        var providers: [MLFeatureProvider] = []
+        let vocabSize = PersonalityVocabulary.tokens.count
 
-            latents.append(latentArr)
-            labels.append(label)
-        }
+        for outProv in backboneOutputs {
+            guard let latentArr = outProv.featureValue(for: Self.latentOutputName)?.multiArrayValue else { continue }
 
-        guard !latents.isEmpty else { throw ServiceError.trainingFailed("No embeddable messages for head training") }
-        print("[PersonalityModel] runMLUpdateTask() — \(latents.count) samples, headModel: \(sourceURL.lastPathComponent)")
+            // Derive label from current best inference (stock or trained head), reusing this backbone pass
+            let tokens = (try? decodeTokens(from: outProv, diagnostics: false)) ?? []
+            let label  = tokens.first.flatMap { PersonalityVocabulary.index[$0] } ?? 0
 
-        // Build MLBatchProvider: latent (512-dim) + one-hot float32 label (325-dim)
-        let providers: [MLFeatureProvider] = try latents.enumerated().map { (i, latentArr) in
-            let labelArr = try MLMultiArray(shape: [NSNumber(value: vocabSize)], dataType: .float32)
-            for k in 0..<vocabSize { labelArr[k] = 0.0 }
-            if labels[i] < vocabSize { labelArr[labels[i]] = 1.0 }
-            return try MLDictionaryFeatureProvider(dictionary: [
+            // Training pair: latent (512-dim) + one-hot float32 label (325-dim)
+            guard let labelArr = try? MLMultiArray(shape: [NSNumber(value: vocabSize)], dataType: .float32) else { continue }
+            // One buffer fill instead of 325 boxed NSNumber stores per sample.
+            labelArr.withUnsafeMutableBufferPointer(ofType: Float.self) { ptr, _ in
+                ptr.update(repeating: 0)
+                if label < vocabSize { ptr[label] = 1 }
+            }
+            guard let pair = try? MLDictionaryFeatureProvider(dictionary: [
                 Self.headModelInputName: latentArr,
                 "label": labelArr
-            ])
+            ]) else { continue }
+            providers.append(pair)
         }
+
+        guard !providers.isEmpty else { throw ServiceError.trainingFailed("No embeddable messages for head training") }
+        print("[PersonalityModel] runMLUpdateTask() — \(providers.count) samples, headModel: \(sourceURL.lastPathComponent)")
+
         let batch = MLArrayBatchProvider(array: providers)
 
-        try await withCheckedThrowingContinuation { (cont: CheckedContinuation<Void, Error>) in
+        let trainedHead = try await withCheckedThrowingContinuation { (cont: CheckedContinuation<MLModel, Error>) in
             do {
                 let updateTask = try MLUpdateTask(
                     forModelAt: sourceURL,
@@ -431,7 +484,7 @@ actor PersonalityModelService {
                     if let err = ctx.task.error { cont.resume(throwing: err); return }
                     do {
                         try ctx.model.write(to: outputURL)
-                        cont.resume()
+                        cont.resume(returning: ctx.model)
                     } catch {
                         cont.resume(throwing: error)
                     }
@@ -442,16 +495,27 @@ actor PersonalityModelService {
             }
         }
 
-        // Reload the updated head model so inference immediately uses new weights
-        if let updatedHead = try? MLModel(contentsOf: outputURL) {
-            headModel    = updatedHead
-            headModelURL = outputURL
-            print("[PersonalityModel] head model reloaded from \(outputURL.lastPathComponent)")
-        }
+        // Use the trained model straight from the update context so inference immediately uses
+        // the new weights — the copy just written to outputURL is for later launches.
+        headModel    = trainedHead
+        headModelURL = outputURL
+        print("[PersonalityModel] head model updated in memory; saved to \(outputURL.lastPathComponent)")
     }
 
     // MARK: - NLEmbedding Helpers
 
+    /// Looks the embedding up until the system provides one; a nil result is not cached,
+    /// so an asset that becomes available later is still picked up.
+    private func sentenceEmbeddingIfAvailable() -> NLEmbedding? {
+        if sentenceEmbedding == nil { sentenceEmbedding = NLEmbedding.sentenceEmbedding(for: .english) }
+        return sentenceEmbedding
+    }
+
+    private func wordEmbeddingIfAvailable() -> NLEmbedding? {
+        if wordEmbedding == nil { wordEmbedding = NLEmbedding.wordEmbedding(for: .english) }
+        return wordEmbedding
+    }
+
     private func computeConversationEmbedding(messages: [Message]) async -> [Float] {
         let userMessages = messages.filter { $0.role == .user }
         let userText = userMessages.map(\.text).joined(separator: " ")
@@ -476,13 +540,13 @@ actor PersonalityModelService {
     }
 
     func computeReferenceEmbedding(from conversations: [DayConversation], contextDocuments: [ContextDocument] = []) async -> [Float] {
-        var allTexts = conversations.flatMap { $0.messages }.filter { $0.role == .user }.map(\.text)
-        allTexts += contextDocuments.map(\.rawText)
-        guard !allTexts.isEmpty else { return [] }
+        // Walk the texts lazily so the corpus is never copied into one intermediate [String].
+        let userTexts = conversations.lazy.flatMap { $0.messages }.filter { $0.role == .user }.map(\.text)
+        let docTexts  = contextDocuments.lazy.map(\.rawText)
 
         var sum   = [Float](repeating: 0, count: config.inputDim)
         var count = 0
-        for text in allTexts {
+        for text in [AnySequence(userTexts), AnySequence(docTexts)].joined() {
             guard var emb = await embed(text: text) else { continue }
             // Normalize dim before accumulating
             if emb.count < config.inputDim {
@@ -519,7 +583,7 @@ actor PersonalityModelService {
         }
 
         // 2. Apple NLEmbedding sentence model (fallback)
-        if let sentEmbed = NLEmbedding.sentenceEmbedding(for: .english),
+        if let sentEmbed = sentenceEmbeddingIfAvailable(),
            let vector    = sentEmbed.vector(for: trimmed) {
             print("[PersonalityModel] embed() — embedder: NLEmbedding.sentence (\(vector.count) dims)")
             return vector.map { Float($0) }
@@ -527,7 +591,7 @@ actor PersonalityModelService {
         print("[PersonalityModel] embed() — NLEmbedding.sentence unavailable, trying word-level averaging")
 
         // 3. Word embedding average — works on simulator/devices without sentence model
-        guard let wordEmbed = NLEmbedding.wordEmbedding(for: .english) else {
+        guard let wordEmbed = wordEmbeddingIfAvailable() else {
             print("[PersonalityModel] embed() — embedder: none (all embedders unavailable)")
             return nil
         }
@@ -560,41 +624,25 @@ actor PersonalityModelService {
         RandomWeightEngine(config: config)
     }
 
-    // MARK: - Top-K sampling
-
-    private func topKTokens(from probs: inout [Float], k: Int, temperature: Float) -> [String] {
-        // Apply temperature
-        if temperature != 1.0 {
-            for i in 0..<probs.count { probs[i] = probs[i] / temperature }
-        }
-        // Softmax
-        let maxVal = probs.max() ?? 0
-        var expVals = probs.map { expf($0 - maxVal) }
-        let sumExp  = expVals.reduce(0, +)
-        for i in 0..<expVals.count { expVals[i] /= sumExp }
-        // Top-k indices
-        let indexed = expVals.enumerated().sorted { $0.element > $1.element }
-        return indexed.prefix(k).compactMap { idx, _ in
-            guard idx < PersonalityVocabulary.tokens.count else { return nil }
-            return PersonalityVocabulary.tokens[idx]
-        }
-    }
-
     // MARK: - Manifest persistence
 
+    // The manifest is read on every listVersions(); reuse one coder pair instead of allocating per call.
+    private let manifestDecoder = JSONDecoder()
+    private let manifestEncoder = JSONEncoder()
+
     private func manifestURL() -> URL {
         modelsDirectory.appendingPathComponent("models_manifest.json")
     }
 
     private func loadManifest() {
-        guard let data = try? Data(contentsOf: manifestURL()),
-              let m = try? JSONDecoder().decode(ModelsManifest.self, from: data) else { return }
+        guard let data = try? Data(contentsOf: manifestURL(), options: .mappedIfSafe),
+              let m = try? manifestDecoder.decode(ModelsManifest.self, from: data) else { return }
         manifest = m
     }
 
     private func saveManifest() {
-        guard let data = try? JSONEncoder().encode(manifest) else { return }
-        try? data.write(to: manifestURL())
+        guard let data = try? manifestEncoder.encode(manifest) else { return }
+        try? data.write(to: manifestURL(), options: .atomic)
     }
 }
 
@@ -617,10 +665,13 @@ struct RandomWeightEngine {
         self.hiddenDim = config.hiddenDim
         self.vocabSize = config.vocabularySize
 
-        // Xavier / He initialisation: scale = sqrt(2 / fan_in)
+        // Xavier / He initialisation: scale = sqrt(2 / fan_in).
+        // Draws come from xorshift, seeded once from the system generator — initial weights
+        // need no cryptographic randomness, and the system source is far slower per value.
+        var rng = SeededRNG(seed: .random(in: 1...UInt64.max))
         func randomMatrix(rows: Int, cols: Int) -> [Float] {
             let scale = sqrtf(2.0 / Float(rows))
-            return (0..<rows*cols).map { _ in Float.random(in: -scale...scale) }
+            return (0..<rows*cols).map { _ in Float.random(in: -scale...scale, using: &rng) }
         }
         w1 = randomMatrix(rows: inputDim,  cols: hiddenDim)
         w2 = randomMatrix(rows: hiddenDim, cols: hiddenDim)
@@ -637,9 +688,9 @@ struct RandomWeightEngine {
         let embMin  = input.min() ?? 0; let embMax = input.max() ?? 0
         print("[Inference] RandomWeightEngine INPUT — \(input.count) dims (concat ×2) | min=\(String(format:"%.4f",embMin)) max=\(String(format:"%.4f",embMax)) | hidden=\(hiddenDim) vocab=\(vocabSize)")
 
-        let h1 = relu(matmul(input, w1, m: 1, k: inputDim,  n: hiddenDim))
-        let h2 = relu(matmul(h1,    w2, m: 1, k: hiddenDim, n: hiddenDim))
-        var logits = matmul(h2, w3, m: 1, k: hiddenDim, n: vocabSize)
+        var h1 = matmul(input, w1, k: inputDim,  n: hiddenDim); relu(&h1)
+        var h2 = matmul(h1,    w2, k: hiddenDim, n: hiddenDim); relu(&h2)
+        let logits = matmul(h2, w3, k: hiddenDim, n: vocabSize)
 
         let h1Active = h1.filter { $0 > 0 }.count
         let h2Active = h2.filter { $0 > 0 }.count
@@ -647,7 +698,7 @@ struct RandomWeightEngine {
         print("[Inference] RandomWeightEngine HIDDEN — h1 active=\(h1Active)/\(hiddenDim) | h2 active=\(h2Active)/\(hiddenDim)")
         print("[Inference] RandomWeightEngine LOGITS — \(logits.count) dims | min=\(String(format:"%.4f",logMin)) max=\(String(format:"%.4f",logMax))")
 
-        let tokens = topKTokens(&logits, k: config.topK)
+        let tokens = topKTokens(logits, k: config.topK)
         print("[Inference] RandomWeightEngine OUTPUT — top-\(config.topK): \(tokens)")
         return tokens
     }
@@ -669,20 +720,18 @@ struct RandomWeightEngine {
             let half = Array(emb.prefix(config.inputDim))
             let fullInput = half + half
             guard fullInput.count == inputDim else { continue }
-            let h1 = relu(matmul(fullInput, w1, m: 1, k: inputDim,  n: hiddenDim))
-            let h2 = relu(matmul(h1,        w2, m: 1, k: hiddenDim, n: hiddenDim))
-            var logits = matmul(h2,          w3, m: 1, k: hiddenDim, n: vocabSize)
-            // Softmax
-            let maxLogit = logits.max() ?? 0
-            var expVals  = logits.map { expf($0 - maxLogit) }
-            let sumExp   = expVals.reduce(0, +)
-            guard sumExp > 0 else { continue }
-            for i in 0..<expVals.count { expVals[i] /= sumExp }
-            // Nudge w3 column of the top-probability token in the direction of h2
-            if let topIdx = expVals.enumerated().max(by: { $0.element < $1.element })?.offset {
-                for row in 0..<hiddenDim {
-                    w3[row * vocabSize + topIdx] += lr * h2[row]
-                }
+            var h1 = matmul(fullInput, w1, k: inputDim,  n: hiddenDim); relu(&h1)
+            var h2 = matmul(h1,        w2, k: hiddenDim, n: hiddenDim); relu(&h2)
+            let logits = matmul(h2,          w3, k: hiddenDim, n: vocabSize)
+            // Softmax preserves ordering, so the top-probability token is simply the arg-max logit.
+            guard logits.allSatisfy(\.isFinite) else { continue }
+            let topIdx = Int(vDSP.indexOfMaximum(logits).0)
+            // Nudge w3 column of the top-probability token in the direction of h2:
+            // one strided axpy (column stride = vocabSize) instead of a scalar loop.
+            let rows = Int32(hiddenDim), stride = Int32(vocabSize)
+            w3.withUnsafeMutableBufferPointer { w in
+                guard let base = w.baseAddress else { return }
+                cblas_saxpy(rows, lr, h2, 1, base + topIdx, stride)
             }
         }
         print("[PersonalityModel] RandomWeightEngine.trainOnMessages() complete")
@@ -690,29 +739,32 @@ struct RandomWeightEngine {
 
     // MARK: - Private
 
-    private func matmul(_ a: [Float], _ b: [Float], m: Int, k: Int, n: Int) -> [Float] {
-        var c = [Float](repeating: 0, count: m * n)
-        cblas_sgemm(CblasRowMajor, CblasNoTrans, CblasNoTrans,
-                    Int32(m), Int32(n), Int32(k),
-                    1.0, a, Int32(k), b, Int32(n),
-                    0.0, &c, Int32(n))
+    /// Row vector (1 × k) times row-major matrix (k × n). Every layer runs on a single sample,
+    /// so this goes through BLAS's matrix-vector kernel rather than a one-row GEMM.
+    private func matmul(_ a: [Float], _ b: [Float], k: Int, n: Int) -> [Float] {
+        var c = [Float](repeating: 0, count: n)
+        cblas_sgemv(CblasRowMajor, CblasTrans,
+                    Int32(k), Int32(n),
+                    1.0, b, Int32(n), a, 1,
+                    0.0, &c, 1)
         return c
     }
 
-    private func relu(_ x: [Float]) -> [Float] {
-        x.map { max(0, $0) }
+    /// In-place ReLU (vDSP threshold at 0) on the freshly allocated matmul output,
+    /// rather than mapping it into a second hidden-width array.
+    private func relu(_ x: inout [Float]) {
+        var zero: Float = 0
+        let n = vDSP_Length(x.count)
+        x.withUnsafeMutableBufferPointer { p in
+            guard let base = p.baseAddress else { return }
+            vDSP_vthres(base, 1, &zero, base, 1, n)
+        }
     }
 
-    private func topKTokens(_ logits: inout [Float], k: Int) -> [String] {
-        let maxVal = logits.max() ?? 0
-        var expVals = logits.map { expf($0 - maxVal) }
-        let sumExp  = expVals.reduce(0, +)
-        guard sumExp > 0 else { return PersonalityVocabulary.randomSample(k: k) }
-        for i in 0..<expVals.count { expVals[i] /= sumExp }
-        let indexed = expVals.enumerated().sorted { $0.element > $1.element }
-        return indexed.prefix(k).compactMap { idx, _ in
-            guard idx < PersonalityVocabulary.tokens.count else { return nil }
-            return PersonalityVocabulary.tokens[idx]
-        }
+    /// Ranks raw logits directly (softmax preserves ordering).
+    /// Non-finite logits — where the softmax would have produced NaN — fall back to a random sample.
+    private func topKTokens(_ logits: [Float], k: Int) -> [String] {
+        guard logits.allSatisfy(\.isFinite) else { return PersonalityVocabulary.randomSample(k: k) }
+        return PersonalityVocabulary.topTokens(for: logits, k: k)
     }
 }
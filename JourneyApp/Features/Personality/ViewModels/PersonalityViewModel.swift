@@ -51,11 +51,14 @@ final class PersonalityViewModel: ObservableObject {
 
         // Warm-start the CoreML model BEFORE training so trainNewVersion can use
         // MLUpdateTask on the stock model rather than falling back to RandomWeightEngine.
-        await modelService.ensureModelLoaded()
+        // Model loading (compile + load) and message gathering (SwiftData + backend) are
+        // independent, so they run side by side; both finish before training or inference.
+        async let modelLoaded: Void = modelService.ensureModelLoaded()
 
         // Gather messages from SwiftData (persisted across restarts) + hydrate from
         // backend if the local DB has no user messages yet (first-time launch).
         let inferMessages = await gatherInferenceMessages()
+        await modelLoaded
 
         // Auto-train if no model version exists yet and we have data to train on
         let existingVersions = await modelService.listVersions()
@@ -190,31 +193,44 @@ final class PersonalityViewModel: ObservableObject {
 
     /// Fetches the last 14 days from the backend and writes them into the shared conversation repository.
     /// Called once per session when local data has no user messages.
+    /// The 14 requests are independent, so they run concurrently; results are written in day order.
     private func hydratePastDaysFromBackend() async {
         pastDaysHydrated = true
         let calendar = Calendar.current
         let today    = Date()
+        let api      = apiClient
         print("[PersonalityModel] hydratePastDays — fetching last 14 days from backend")
-        var fetched  = 0
-        for offset in 1...14 {
-            guard let date = calendar.date(byAdding: .day, value: -offset, to: today) else { continue }
-            let dayKey = DayKey.from(date)
-            do {
-                let response = try await apiClient.get(
-                    "/days/\(dayKey.rawValue)",
-                    responseType: DayDataResponse.self
-                )
-                let messages = response.conversation.messages.map { $0.toMessage() }
-                guard !messages.isEmpty else { continue }
-                await conversationRepository.setMessages(messages, dayKey: dayKey)
-                fetched += 1
-            } catch {
-                // 404 = no data for that day — expected, not an error
-                if let httpErr = error as? HTTPError, httpErr.status == 404 { continue }
-                print("[PersonalityModel] hydratePastDays — error fetching \(dayKey.rawValue): \(error)")
+        let dayKeys = (1...14).compactMap { offset in
+            calendar.date(byAdding: .day, value: -offset, to: today).map { DayKey.from($0) }
+        }
+
+        let results = await withTaskGroup(of: (DayKey, [Message]).self) { group -> [DayKey: [Message]] in
+            for dayKey in dayKeys {
+                group.addTask {
+                    do {
+                        let response = try await api.get(
+                            "/days/\(dayKey.rawValue)",
+                            responseType: DayDataResponse.self
+                        )
+                        return (dayKey, response.conversation.messages.map { $0.toMessage() })
+                    } catch {
+                        // 404 = no data for that day — expected, not an error
+                        if let httpErr = error as? HTTPError, httpErr.status == 404 { return (dayKey, []) }
+                        print("[PersonalityModel] hydratePastDays — error fetching \(dayKey.rawValue): \(error)")
+                        return (dayKey, [])
+                    }
+                }
             }
+            var byDay: [DayKey: [Message]] = [:]
+            for await (dayKey, messages) in group where !messages.isEmpty { byDay[dayKey] = messages }
+            return byDay
+        }
+
+        for dayKey in dayKeys {
+            guard let messages = results[dayKey] else { continue }
+            await conversationRepository.setMessages(messages, dayKey: dayKey)
         }
-        print("[PersonalityModel] hydratePastDays — loaded \(fetched) past days into local repo")
+        print("[PersonalityModel] hydratePastDays — loaded \(results.count) past days into local repo")
     }
 
     // MARK: - Backend call
@@ -57,6 +57,11 @@ final class APIClient: APIClientProtocol {
 
     private let baseURL: URL
 
+    /// Shared coders — default-configured, so one instance serves every request
+    /// (decode/encode are safe to call concurrently).
+    private let decoder = JSONDecoder()
+    private let encoder = JSONEncoder()
+
     /// Injected token provider — defaults to reading from Keychain.
     var tokenProvider: TokenProviderProtocol
 
@@ -83,7 +88,7 @@ final class APIClient: APIClientProtocol {
         body: Body,
         responseType: Response.Type
     ) async throws -> Response {
-        let bodyData = try JSONEncoder().encode(body)
+        let bodyData = try encoder.encode(body)
         print("[APIClient] POST \(path) — body: \(String(data: bodyData, encoding: .utf8) ?? "<binary>")")
         let request  = try buildRequest(path: path, method: "POST", body: bodyData, authenticated: true)
         return try await perform(request, responseType: responseType, retryOn401: true)
@@ -109,7 +114,7 @@ final class APIClient: APIClientProtocol {
         body: Body,
         responseType: Response.Type
     ) async throws -> Response {
-        let bodyData = try JSONEncoder().encode(body)
+        let bodyData = try encoder.encode(body)
         print("[APIClient] POST (public) \(path) — body: \(String(data: bodyData, encoding: .utf8) ?? "<binary>")")
         let request  = try buildRequest(path: path, method: "POST", body: bodyData, authenticated: false)
         return try await perform(request, responseType: responseType, retryOn401: false)
@@ -166,7 +171,7 @@ final class APIClient: APIClientProtocol {
             throw HTTPError(status: http.statusCode, data: data)
         }
 
-        return try JSONDecoder().decode(Response.self, from: data)
+        return try decoder.decode(Response.self, from: data)
     }
 }
 
@@ -0,0 +1,81 @@
+//
+//  CompiledModelCacheTests.swift
+//  Journey AppTests
+//
+
+import Foundation
+import Testing
+@testable import Journey_App
+
+struct CompiledModelCacheTests {
+
+    /// Counts compiles and writes a stand-in .mlmodelc into a fresh temp directory, like compileModel(at:).
+    private actor FakeCompiler {
+        private(set) var calls = 0
+
+        func compile(_ packageURL: URL) throws -> URL {
+            calls += 1
+            let out = FileManager.default.temporaryDirectory
+                .appendingPathComponent("\(UUID().uuidString).mlmodelc", isDirectory: true)
+            try FileManager.default.createDirectory(at: out, withIntermediateDirectories: true)
+            try "compile \(calls)".write(to: out.appendingPathComponent("model.mil"), atomically: true, encoding: .utf8)
+            return out
+        }
+    }
+
+    private func makePackage(in root: URL) throws -> URL {
+        let package = root.appendingPathComponent("Model.mlpackage", isDirectory: true)
+        try FileManager.default.createDirectory(at: package, withIntermediateDirectories: true)
+        try "weights".write(to: package.appendingPathComponent("weight.bin"), atomically: true, encoding: .utf8)
+        return package
+    }
+
+    @Test func unchangedStampReusesCachedModel() async throws {
+        let root = FileManager.default.temporaryDirectory.appendingPathComponent(UUID().uuidString, isDirectory: true)
+        defer { try? FileManager.default.removeItem(at: root) }
+        let package  = try makePackage(in: root)
+        let cacheDir = CompiledModelCache.directory(in: root)
+        let compiler = FakeCompiler()
+
+        let first  = try await CompiledModelCache.compiledURL(for: package, cacheDirectory: cacheDir) { try await compiler.compile($0) }
+        let second = try await CompiledModelCache.compiledURL(for: package, cacheDirectory: cacheDir) { try await compiler.compile($0) }
+
+        #expect(first == second)
+        #expect(first.deletingLastPathComponent().standardizedFileURL == cacheDir.standardizedFileURL)
+        #expect(await compiler.calls == 1)
+    }
+
+    @Test func changedStampRecompilesAndSwapsCachedModel() async throws {
+        let root = FileManager.default.temporaryDirectory.appendingPathComponent(UUID().uuidString, isDirectory: true)
+        defer { try? FileManager.default.removeItem(at: root) }
+        let package  = try makePackage(in: root)
+        let cacheDir = CompiledModelCache.directory(in: root)
+        let compiler = FakeCompiler()
+
+        let first = try await CompiledModelCache.compiledURL(for: package, cacheDirectory: cacheDir) { try await compiler.compile($0) }
+        // A rewritten weight file changes the package's byte count, and so its stamp.
+        try "retrained weights".write(to: package.appendingPathComponent("weight.bin"), atomically: true, encoding: .utf8)
+        let second = try await CompiledModelCache.compiledURL(for: package, cacheDirectory: cacheDir) { try await compiler.compile($0) }
+
+        #expect(first == second)
+        #expect(await compiler.calls == 2)
+        let contents = try String(contentsOf: second.appendingPathComponent("model.mil"), encoding: .utf8)
+        #expect(contents == "compile 2")
+        // Only the cache slot and its stamp remain; the staged copy was swapped in.
+        let entries = try FileManager.default.contentsOfDirectory(atPath: cacheDir.path).sorted()
+        #expect(entries == ["Model.mlmodelc", "Model.stamp"])
+    }
+
+    @Test func cacheDirectoryIsExcludedFromBackup() async throws {
+        let root = FileManager.default.temporaryDirectory.appendingPathComponent(UUID().uuidString, isDirectory: true)
+        defer { try? FileManager.default.removeItem(at: root) }
+        let package  = try makePackage(in: root)
+        let cacheDir = CompiledModelCache.directory(in: root)
+        let compiler = FakeCompiler()
+
+        _ = try await CompiledModelCache.compiledURL(for: package, cacheDirectory: cacheDir) { try await compiler.compile($0) }
+
+        let values = try cacheDir.resourceValues(forKeys: [.isExcludedFromBackupKey])
+        #expect(values.isExcludedFromBackup == true)
+    }
+}